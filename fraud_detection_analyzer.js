@@ -5,9 +5,105 @@
  * Demonstrates the Oqualtix App's anomaly detection capabilities.
  */
 
+import crypto from 'crypto';
 import fs from 'fs';
 import path from 'path';
 
+// Common approval thresholds, ascending; amounts just under one suggest approval evasion
+const APPROVAL_THRESHOLDS = [1000, 2500, 5000, 10000, 25000, 50000];
+
+/**
+ * The approval threshold an amount sits just under (within $100), or null
+ */
+function evadedThreshold(amount) {
+    // Only the nearest threshold above the amount can be within $100 of it
+    const threshold = APPROVAL_THRESHOLDS[StatUtils.searchSorted(APPROVAL_THRESHOLDS, amount)];
+    return threshold !== undefined && amount >= threshold - 100 ? threshold : null;
+}
+
+/**
+ * The `k` highest-risk anomalies, highest first, with ties kept in list order.
+ * Keeps a size-k min-heap instead of sorting the whole list.
+ */
+function topByRiskScore(anomalies, k) {
+    // heap[0] is the lowest-ranked entry kept so far; lower index wins ties
+    const heap = [];
+    const ranksBelow = (a, b) => a.riskScore < b.riskScore || (a.riskScore === b.riskScore && a.index > b.index);
+    const swap = (i, j) => { [heap[i], heap[j]] = [heap[j], heap[i]]; };
+    
+    anomalies.forEach((anomaly, index) => {
+        const entry = { riskScore: anomaly.riskScore, index };
+        if (heap.length < k) {
+            heap.push(entry);
+            for (let i = heap.length - 1; i > 0 && ranksBelow(heap[i], heap[(i - 1) >> 1]); i = (i - 1) >> 1) {
+                swap(i, (i - 1) >> 1);
+            }
+        } else if (k > 0 && ranksBelow(heap[0], entry)) {
+            heap[0] = entry;
+            for (let i = 0; ;) {
+                const left = 2 * i + 1;
+                const right = left + 1;
+                let lowest = i;
+                if (left < heap.length && ranksBelow(heap[left], heap[lowest])) lowest = left;
+                if (right < heap.length && ranksBelow(heap[right], heap[lowest])) lowest = right;
+                if (lowest === i) break;
+                swap(i, lowest);
+                i = lowest;
+            }
+        }
+    });
+    
+    return heap
+        .sort((a, b) => b.riskScore - a.riskScore || a.index - b.index)
+        .map(entry => anomalies[entry.index]);
+}
+
+// Reason text for the high-volume, row-level anomaly types. Those detectors store
+// only the numeric fields and leave `reason: undefined` on every record; the text
+// is built when an anomaly is actually displayed or exported (see formatAnomalyReason).
+const REASON_FORMATTERS = {
+    'Statistical Outlier': anomaly => `Amount $${anomaly.amount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})} exceeds vendor threshold $${anomaly.threshold.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})} (${anomaly.sigmaMultiplier.toFixed(1)}σ above mean)`,
+    'Round Dollar Pattern': anomaly => `Suspicious round dollar amount: $${anomaly.amount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}`,
+    'Threshold Evasion': anomaly => `Amount $${anomaly.amount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})} just under $${anomaly.threshold.toLocaleString('en-US')} threshold (possible approval evasion)`,
+    'Round Dollar Embezzlement': anomaly => `Round dollar amount pattern: $${anomaly.amount.toLocaleString()} (typical of corporate card abuse)`,
+    'Threshold Evasion Embezzlement': anomaly => `Amount $${anomaly.amount.toLocaleString()} suspiciously close to $${anomaly.threshold.toLocaleString()} threshold`,
+    'Off-Hours Embezzlement': anomaly => `Large transaction during off-hours: $${anomaly.amount.toLocaleString()} on ${anomaly.date.toLocaleDateString()} at ${anomaly.date.getHours()}:00`
+};
+
+/**
+ * The anomaly's reason text, formatting it from its fields if it was deferred
+ */
+function formatAnomalyReason(anomaly) {
+    if (anomaly.reason !== undefined) return anomaly.reason;
+    const formatter = REASON_FORMATTERS[anomaly.anomalyType];
+    return formatter ? formatter(anomaly) : '';
+}
+
+// Per-vendor statistics stored in the vendor stats table, one Float64Array each
+const VENDOR_STAT_FIELDS = ['count', 'mean', 'std', 'median', 'min', 'max', 'q25', 'q75', 'iqr', 'threshold3Sigma'];
+
+// Recent runFullAnalysis() results keyed by input fingerprint, oldest first. Entries
+// hold their own copies of the records, so callers never share objects through it.
+const analysisCache = new Map();
+const ANALYSIS_CACHE_MAX_SIZE = 16;
+
+/**
+ * Drop every cached analysis result, e.g. to release memory after large inputs
+ */
+function clearAnalysisCache() {
+    analysisCache.clear();
+}
+
+// Detection methods run by runFullAnalysis, in result order
+const DETECTORS = [
+    'detectStatisticalOutliers',     // 1. Statistical outliers (mean + 3σ)
+    'detectRoundDollarPatterns',     // 2. Round dollar patterns and threshold evasion
+    'detectFrequencyAnomalies',      // 3. Frequency anomalies
+    'detectVendorConcentration',     // 4. Vendor concentration
+    'detectEmbezzlementPatterns',    // 5. Embezzlement pattern detection
+    'detectKickbackSchemes'          // 6. Kickback scheme detection
+];
+
 /**
  * Utility functions for statistical calculations
  */
@@ -24,7 +120,10 @@ class StatUtils {
     }
     
     static median(arr) {
-        const sorted = [...arr].sort((a, b) => a - b);
+        return this.medianSorted([...arr].sort((a, b) => a - b));
+    }
+    
+    static medianSorted(sorted) {
         const mid = Math.floor(sorted.length / 2);
         return sorted.length % 2 === 0 
             ? (sorted[mid - 1] + sorted[mid]) / 2 
@@ -32,7 +131,10 @@ class StatUtils {
     }
     
     static quantile(arr, q) {
-        const sorted = [...arr].sort((a, b) => a - b);
+        return this.quantileSorted([...arr].sort((a, b) => a - b), q);
+    }
+    
+    static quantileSorted(sorted, q) {
         const pos = (sorted.length - 1) * q;
         const base = Math.floor(pos);
         const rest = pos - base;
@@ -43,6 +145,109 @@ class StatUtils {
             return sorted[base];
         }
     }
+    
+    /**
+     * Clamp every element of a Float64Array to [lo, hi] in place
+     */
+    static clip(values, lo, hi) {
+        for (let i = 0; i < values.length; i++) {
+            values[i] = Math.min(hi, Math.max(lo, values[i]));
+        }
+        return values;
+    }
+    
+    /**
+     * Index of the first element of `sorted` greater than `value` (binary search)
+     */
+    static searchSorted(sorted, value) {
+        let lo = 0;
+        let hi = sorted.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (sorted[mid] <= value) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+}
+
+/**
+ * Dictionary-encode one field of the rows: returns Int32Array `codes` indexing
+ * into `dictionary`, the distinct values in first-seen order. String work done
+ * per distinct value (lowercasing, matching) then runs once per entry, not per row.
+ */
+function dictionaryEncode(rows, field) {
+    const codes = new Int32Array(rows.length);
+    const dictionary = [];
+    const codeByValue = new Map();
+    
+    for (let i = 0; i < rows.length; i++) {
+        const value = rows[i][field];
+        let code = codeByValue.get(value);
+        if (code === undefined) {
+            code = dictionary.length;
+            dictionary.push(value);
+            codeByValue.set(value, code);
+        }
+        codes[i] = code;
+    }
+    
+    return { codes, dictionary };
+}
+
+/**
+ * Single streaming pass over the amount/vendor/month columns shared by the four
+ * column detectors. For each row it evaluates the statistical outlier test
+ * (amount > threshold3Sigma of its vendor; skipped when `statsTable` is null),
+ * the round-dollar and threshold-evasion tests, and accumulates the per-vendor
+ * monthly counts and amount totals behind frequency and concentration analysis.
+ */
+function scanColumns(columns, statsTable) {
+    const { amount, vendorCode, month, vendors } = columns;
+    const thresholds = statsTable ? statsTable.threshold3Sigma : null;
+    
+    const outlierRows = [];
+    const roundRows = [];
+    const evasionRows = [];
+    const evasionThresholds = [];
+    const monthlyCounts = vendors.map(() => new Map());
+    const vendorTotals = new Float64Array(vendors.length);
+    let totalAmount = 0;
+    
+    for (let i = 0; i < amount.length; i++) {
+        const value = amount[i];
+        const code = vendorCode[i];
+        
+        // Vendors without stats carry an Infinity threshold, so no extra branch
+        if (thresholds !== null && value > thresholds[code]) {
+            outlierRows.push(i);
+        }
+        
+        // Exact test: whole-dollar amounts are exact in a double, and any sub-cent
+        // remainder (tenth-cent skimming) must keep an amount from counting as round
+        if (value % 100 === 0 && value >= 1000) {
+            roundRows.push(i);
+        }
+        
+        const threshold = evadedThreshold(value);
+        if (threshold !== null) {
+            evasionRows.push(i);
+            evasionThresholds.push(threshold);
+        }
+        
+        // Rows with an invalid date (month -1) belong to no month
+        if (month[i] >= 0) {
+            const vendorMonths = monthlyCounts[code];
+            vendorMonths.set(month[i], (vendorMonths.get(month[i]) || 0) + 1);
+        }
+        vendorTotals[code] += value;
+        totalAmount += value;
+    }
+    
+    return { outlierRows, roundRows, evasionRows, evasionThresholds, monthlyCounts, vendorTotals, totalAmount };
 }
 
 /**
@@ -53,16 +258,28 @@ class FraudDetectionAnalyzer {
         this.sigmaThreshold = sigmaThreshold;
         this.minTransactions = minTransactions;
         this.vendorStats = {};
+        this.vendorStatsTable = null;
         this.anomalies = [];
         this.data = [];
+        this.columns = null;
+        this.columnScan = null;
     }
     
     /**
      * Load transaction data from JSON array or CSV file
+     * 
+     * Rows passed in via `data` are used in place unless `options.copy` is set:
+     * their `date` strings are replaced by Date objects. The caller's array
+     * itself is never reordered; rows are only sorted by date, on a copy of the
+     * array, when `options.sort` is set, since no detector depends on input order.
+     * Rows without a `transaction_id` are reported as `txn_<index>`, their
+     * position in `this.data`; the ID is kept in the columns, not the row.
      */
-    loadData(csvFile = null, data = null) {
+    loadData(csvFile = null, data = null, options = {}) {
+        const { copy = false, sort = false } = options;
+        
         if (data !== null) {
-            this.data = [...data];
+            this.data = copy ? data.map(row => ({ ...row })) : data;
         } else if (csvFile) {
             // Simple CSV parsing (assumes comma-separated values)
             const csvContent = fs.readFileSync(csvFile, 'utf8');
@@ -76,9 +293,8 @@ class FraudDetectionAnalyzer {
                     obj[header] = values[index];
                 });
                 
-                // Convert amount to number and date to Date object
+                // Convert amount to number; dates are parsed below
                 obj.amount = parseFloat(obj.amount);
-                obj.date = new Date(obj.date);
                 return obj;
             });
         } else {
@@ -93,52 +309,182 @@ class FraudDetectionAnalyzer {
             throw new Error(`Missing required columns: ${missingCols.join(', ')}`);
         }
         
-        // Convert date strings to Date objects and sort
-        this.data = this.data.map(row => ({
-            ...row,
-            date: row.date instanceof Date ? row.date : new Date(row.date)
-        })).sort((a, b) => a.date - b.date);
+        // Convert date strings to Date objects, parsing each distinct string once
+        const parsedDates = new Map();
+        this.data.forEach(row => {
+            if (row.date instanceof Date) return;
+            let time = parsedDates.get(row.date);
+            if (time === undefined) {
+                time = new Date(row.date).getTime();
+                parsedDates.set(row.date, time);
+            }
+            row.date = new Date(time);
+        });
+        
+        if (sort) {
+            this.data = [...this.data].sort((a, b) => a.date - b.date);
+        }
         
+        this.refreshColumns();
         return this.data;
     }
     
+    /**
+     * Rebuild the columns from `this.data` and drop everything derived from the
+     * old ones: vendor statistics, the fused column scan and the cached vendor row
+     * indices. Call after modifying `this.data` or its rows; dates must stay Date
+     * objects, as loadData leaves them.
+     */
+    refreshColumns() {
+        // Vendor stats are indexed by vendor code, which the new columns reassign
+        this.columns = this.buildColumns();
+        this.vendorStatsTable = null;
+        this.vendorStats = {};
+        this.columnScan = null;
+        return this.columns;
+    }
+    
+    /**
+     * The fused column scan (see scanColumns) behind the statistical, round-dollar,
+     * frequency and concentration detectors. Computed on first use and shared by
+     * all four, so running them together reads the columns once instead of four
+     * times; reset whenever the columns or vendor statistics change.
+     */
+    getColumnScan() {
+        if (!this.columnScan) {
+            this.columnScan = scanColumns(this.columns, this.vendorStatsTable);
+        }
+        return this.columnScan;
+    }
+    
+    /**
+     * Build the columnar view the detectors scan: amounts as a Float64Array,
+     * dates as epoch-ms `time` and integer `month` (year * 12 + month, or -1 for
+     * an invalid date) arrays, and the string columns (vendor, description,
+     * category) dictionary-encoded, so per-row grouping and matching is an
+     * integer index instead of string work. `transactionId` holds each row's ID,
+     * with the positional fallback filled in once so detectors never need one.
+     * Use refreshColumns() to replace the columns along with their derived state.
+     */
+    buildColumns() {
+        const amount = Float64Array.from(this.data, row => row.amount);
+        const time = Float64Array.from(this.data, row => row.date.getTime());
+        // Int32Array would store an invalid date's NaN month as 0 (January of year 0)
+        const month = Int32Array.from(this.data, (row, i) => (
+            Number.isNaN(time[i]) ? -1 : row.date.getFullYear() * 12 + row.date.getMonth()
+        ));
+        const vendor = dictionaryEncode(this.data, 'vendor');
+        const description = dictionaryEncode(this.data, 'description');
+        const category = dictionaryEncode(this.data, 'category');
+        const transactionId = this.data.map((row, index) => row.transaction_id || `txn_${index}`);
+        
+        return {
+            amount,
+            time,
+            month,
+            vendorCode: vendor.codes,
+            vendors: vendor.dictionary,
+            descriptionCode: description.codes,
+            descriptions: description.dictionary,
+            categoryCode: category.codes,
+            categories: category.dictionary,
+            transactionId
+        };
+    }
+    
+    /**
+     * Row indices for each vendor code (the pandas `groupby().indices` idiom),
+     * built with one counting pass on first use and cached with the columns.
+     * Per-vendor work then slices rows directly instead of scanning all rows.
+     */
+    getVendorRowIndices() {
+        if (!this.columns.vendorRows) {
+            const { vendorCode, vendors } = this.columns;
+            const counts = new Int32Array(vendors.length);
+            for (let i = 0; i < vendorCode.length; i++) {
+                counts[vendorCode[i]]++;
+            }
+            
+            const vendorRows = Array.from(counts, count => new Int32Array(count));
+            const filled = new Int32Array(vendors.length);
+            for (let i = 0; i < vendorCode.length; i++) {
+                const code = vendorCode[i];
+                vendorRows[code][filled[code]++] = i;
+            }
+            this.columns.vendorRows = vendorRows;
+        }
+        return this.columns.vendorRows;
+    }
+    
+    /**
+     * Content hash of everything the detectors read, combined with the
+     * analyzer settings; identical inputs always produce the same key.
+     */
+    computeFingerprint() {
+        const { amount, time, vendorCode, vendors, descriptionCode, descriptions, categoryCode, categories, transactionId } = this.columns;
+        const hash = crypto.createHash('sha1');
+        
+        hash.update(`${this.sigmaThreshold}|${this.minTransactions}|${amount.length}`);
+        hash.update(new Uint8Array(amount.buffer));
+        hash.update(new Uint8Array(time.buffer));
+        hash.update(new Uint8Array(vendorCode.buffer));
+        hash.update(new Uint8Array(descriptionCode.buffer));
+        hash.update(new Uint8Array(categoryCode.buffer));
+        hash.update(JSON.stringify([vendors, descriptions, categories]));
+        hash.update(JSON.stringify(transactionId));
+        
+        return hash.digest('hex');
+    }
+    
     /**
      * Compute mean, std deviation, and other stats per vendor
+     * 
+     * The stats are kept in `this.vendorStatsTable` as one Float64Array per field,
+     * indexed by vendor code, so detectors read `mean[vendorCode[i]]` directly.
+     * Vendors below `minTransactions` have count 0, NaN stats and an Infinity
+     * threshold. `this.vendorStats` is the same data keyed by vendor name.
      */
     computeVendorStatistics() {
         console.log("Computing per-vendor statistics...");
         
-        const vendorStats = {};
-        const vendorGroups = {};
-        
-        // Group transactions by vendor
-        this.data.forEach(row => {
-            if (!vendorGroups[row.vendor]) {
-                vendorGroups[row.vendor] = [];
-            }
-            vendorGroups[row.vendor].push(row.amount);
+        const { amount, vendors } = this.columns;
+        const table = { vendors };
+        VENDOR_STAT_FIELDS.forEach(field => {
+            table[field] = new Float64Array(vendors.length).fill(NaN);
         });
+        table.count.fill(0);
+        table.threshold3Sigma.fill(Infinity);
         
-        // Compute statistics for each vendor
-        Object.entries(vendorGroups).forEach(([vendor, amounts]) => {
-            if (amounts.length >= this.minTransactions) {
-                const stats = {
-                    count: amounts.length,
-                    mean: StatUtils.mean(amounts),
-                    std: StatUtils.stdev(amounts),
-                    median: StatUtils.median(amounts),
-                    min: Math.min(...amounts),
-                    max: Math.max(...amounts),
-                    q25: StatUtils.quantile(amounts, 0.25),
-                    q75: StatUtils.quantile(amounts, 0.75)
-                };
-                stats.iqr = stats.q75 - stats.q25;
-                stats.threshold3Sigma = stats.mean + (this.sigmaThreshold * stats.std);
-                vendorStats[vendor] = stats;
+        // Compute statistics for each vendor. Mean and std are summed in row order
+        // so they match the grouped amounts bit for bit; a sorted copy is made once
+        // and every order statistic (min/max/median/quartiles) is read off that
+        const vendorStats = {};
+        this.getVendorRowIndices().forEach((rows, code) => {
+            if (rows.length >= this.minTransactions) {
+                const amounts = Float64Array.from(rows, i => amount[i]);
+                const sorted = amounts.slice().sort();
+                table.count[code] = amounts.length;
+                table.mean[code] = StatUtils.mean(amounts);
+                table.std[code] = StatUtils.stdev(amounts);
+                table.median[code] = StatUtils.medianSorted(sorted);
+                table.min[code] = sorted[0];
+                table.max[code] = sorted[sorted.length - 1];
+                table.q25[code] = StatUtils.quantileSorted(sorted, 0.25);
+                table.q75[code] = StatUtils.quantileSorted(sorted, 0.75);
+                table.iqr[code] = table.q75[code] - table.q25[code];
+                table.threshold3Sigma[code] = table.mean[code] + (this.sigmaThreshold * table.std[code]);
+                
+                const stats = {};
+                VENDOR_STAT_FIELDS.forEach(field => {
+                    stats[field] = table[field][code];
+                });
+                vendorStats[vendors[code]] = stats;
             }
         });
         
+        this.vendorStatsTable = table;
         this.vendorStats = vendorStats;
+        this.columnScan = null;
         return vendorStats;
     }
     
@@ -148,37 +494,41 @@ class FraudDetectionAnalyzer {
     detectStatisticalOutliers() {
         console.log("Detecting statistical outliers (mean + 3σ method)...");
         
-        const outliers = [];
+        // No vendor statistics computed yet, so nothing to compare against
+        if (!this.vendorStatsTable) {
+            return [];
+        }
         
-        this.data.forEach((row, index) => {
-            const vendor = row.vendor;
-            const amount = row.amount;
-            
-            if (vendor in this.vendorStats) {
-                const stats = this.vendorStats[vendor];
-                const threshold = stats.threshold3Sigma;
-                
-                if (amount > threshold) {
-                    const sigmaMultiplier = stats.std > 0 ? (amount - stats.mean) / stats.std : 0;
-                    const outlier = {
-                        transactionId: row.transaction_id || `txn_${index}`,
-                        date: row.date,
-                        vendor: vendor,
-                        amount: amount,
-                        description: row.description,
-                        anomalyType: 'Statistical Outlier',
-                        riskScore: Math.min(100, Math.max(0, (sigmaMultiplier - 3) * 20 + 70)),
-                        reason: `Amount $${amount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})} exceeds vendor threshold $${threshold.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})} (${sigmaMultiplier.toFixed(1)}σ above mean)`,
-                        vendorMean: stats.mean,
-                        vendorStd: stats.std,
-                        sigmaMultiplier: sigmaMultiplier
-                    };
-                    outliers.push(outlier);
-                }
-            }
-        });
+        // Rows over their vendor's threshold come from the shared column scan;
+        // only those rows are scored and materialized
+        const { amount: amounts, vendorCode, transactionId } = this.columns;
+        const { mean, std, threshold3Sigma } = this.vendorStatsTable;
+        const { outlierRows } = this.getColumnScan();
         
-        return outliers;
+        const sigmas = Float64Array.from(outlierRows, i => {
+            const code = vendorCode[i];
+            return std[code] > 0 ? (amounts[i] - mean[code]) / std[code] : 0;
+        });
+        const riskScores = StatUtils.clip(sigmas.map(sigma => (sigma - 3) * 20 + 70), 0, 100);
+
+        return outlierRows.map((index, k) => {
+            const row = this.data[index];
+            const code = vendorCode[index];
+            return {
+                transactionId: transactionId[index],
+                date: row.date,
+                vendor: row.vendor,
+                amount: amounts[index],
+                description: row.description,
+                anomalyType: 'Statistical Outlier',
+                riskScore: riskScores[k],
+                reason: undefined,
+                vendorMean: mean[code],
+                vendorStd: std[code],
+                sigmaMultiplier: sigmas[k],
+                threshold: threshold3Sigma[code]
+            };
+        });
     }
     
     /**
@@ -189,45 +539,45 @@ class FraudDetectionAnalyzer {
         
         const suspiciousPatterns = [];
         
-        // Common approval thresholds
-        const thresholds = [1000, 2500, 5000, 10000, 25000, 50000];
+        // Both masks come from the shared column scan
+        const { amount: amounts, transactionId } = this.columns;
+        const { roundRows: roundHits, evasionRows: evasionHits, evasionThresholds } = this.getColumnScan();
+        
+        // Score each hit column at once; higher round amounts = higher risk
+        const roundScores = StatUtils.clip(Float64Array.from(roundHits, i => 40 + (amounts[i] / 10000)), -Infinity, 85);
+        const evasionScores = new Float64Array(evasionHits.length).fill(80);
+        
+        // Check for round dollar amounts
+        roundHits.forEach((index, k) => {
+            const row = this.data[index];
+            const amount = amounts[index];
+            suspiciousPatterns.push({
+                transactionId: transactionId[index],
+                date: row.date,
+                vendor: row.vendor,
+                amount: amount,
+                description: row.description,
+                anomalyType: 'Round Dollar Pattern',
+                riskScore: roundScores[k],
+                reason: undefined
+            });
+        });
         
-        this.data.forEach((row, index) => {
-            const amount = row.amount;
-            
-            // Check for round dollar amounts
-            if (amount % 100 === 0 && amount >= 1000) {
-                const riskScore = Math.min(85, 40 + (amount / 10000));  // Higher amounts = higher risk
-                const pattern = {
-                    transactionId: row.transaction_id || `txn_${index}`,
-                    date: row.date,
-                    vendor: row.vendor,
-                    amount: amount,
-                    description: row.description,
-                    anomalyType: 'Round Dollar Pattern',
-                    riskScore: riskScore,
-                    reason: `Suspicious round dollar amount: $${amount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}`
-                };
-                suspiciousPatterns.push(pattern);
-            }
-            
-            // Check for threshold evasion (amounts just under common thresholds)
-            for (const threshold of thresholds) {
-                if (threshold - 100 <= amount && amount < threshold) {
-                    const pattern = {
-                        transactionId: row.transaction_id || `txn_${index}`,
-                        date: row.date,
-                        vendor: row.vendor,
-                        amount: amount,
-                        description: row.description,
-                        anomalyType: 'Threshold Evasion',
-                        riskScore: 80,
-                        reason: `Amount $${amount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})} just under $${threshold.toLocaleString('en-US')} threshold (possible approval evasion)`
-                    };
-                    suspiciousPatterns.push(pattern);
-                    break;
-                }
-            }
+        // Check for threshold evasion (amounts just under common thresholds)
+        evasionHits.forEach((index, k) => {
+            const row = this.data[index];
+            const amount = amounts[index];
+            suspiciousPatterns.push({
+                transactionId: transactionId[index],
+                date: row.date,
+                vendor: row.vendor,
+                amount: amount,
+                description: row.description,
+                anomalyType: 'Threshold Evasion',
+                riskScore: evasionScores[k],
+                reason: undefined,
+                threshold: evasionThresholds[k]
+            });
         });
         
         return suspiciousPatterns;
@@ -241,55 +591,35 @@ class FraudDetectionAnalyzer {
         
         const frequencyAnomalies = [];
         
-        // Group by vendor and month
-        const monthlyCountsMap = new Map();
-        
-        this.data.forEach(row => {
-            const yearMonth = `${row.date.getFullYear()}-${(row.date.getMonth() + 1).toString().padStart(2, '0')}`;
-            const key = `${row.vendor}|${yearMonth}`;
-            monthlyCountsMap.set(key, (monthlyCountsMap.get(key) || 0) + 1);
-        });
-        
-        // Convert to array format
-        const monthlyCounts = [];
-        monthlyCountsMap.forEach((count, key) => {
-            const [vendor, yearMonth] = key.split('|');
-            monthlyCounts.push({ vendor, yearMonth, transactionCount: count });
-        });
-        
-        // Analyze frequency for each vendor
-        const vendorFrequencies = {};
-        monthlyCounts.forEach(row => {
-            if (!vendorFrequencies[row.vendor]) {
-                vendorFrequencies[row.vendor] = [];
-            }
-            vendorFrequencies[row.vendor].push(row.transactionCount);
-        });
+        // Per-vendor monthly transaction counts come from the shared column scan
+        const { vendors } = this.columns;
+        const { monthlyCounts } = this.getColumnScan();
         
-        Object.entries(vendorFrequencies).forEach(([vendor, counts]) => {
-            if (counts.length >= 3) {  // Need at least 3 months of data
-                const meanFreq = StatUtils.mean(counts);
-                const stdFreq = StatUtils.stdev(counts);
-                
-                if (stdFreq > 0) {
-                    monthlyCounts.filter(row => row.vendor === vendor).forEach(row => {
-                        const count = row.transactionCount;
-                        if (count > meanFreq + (2 * stdFreq) && count >= 10) {  // Unusual spike
-                            const anomaly = {
-                                transactionId: `freq_${vendor}_${row.yearMonth}`,
-                                date: row.yearMonth,
-                                vendor: vendor,
-                                amount: 0,  // Frequency anomaly, not amount-based
-                                description: `High frequency month: ${count} transactions`,
-                                anomalyType: 'Frequency Spike',
-                                riskScore: Math.min(90, 50 + (count - meanFreq) * 5),
-                                reason: `Unusual payment frequency: ${count} transactions vs. typical ${meanFreq.toFixed(1)} per month`
-                            };
-                            frequencyAnomalies.push(anomaly);
-                        }
+        // Score each vendor's months against that vendor's own monthly mean/std
+        monthlyCounts.forEach((vendorMonths, code) => {
+            const vendor = vendors[code];
+            if (vendorMonths.size < 3) return;  // Need at least 3 months of data
+            
+            const counts = [...vendorMonths.values()];
+            const meanFreq = StatUtils.mean(counts);
+            const stdFreq = StatUtils.stdev(counts);
+            if (stdFreq <= 0) return;
+            
+            vendorMonths.forEach((count, monthKey) => {
+                if (count > meanFreq + (2 * stdFreq) && count >= 10) {  // Unusual spike
+                    const yearMonth = `${Math.floor(monthKey / 12)}-${(monthKey % 12 + 1).toString().padStart(2, '0')}`;
+                    frequencyAnomalies.push({
+                        transactionId: `freq_${vendor}_${yearMonth}`,
+                        date: yearMonth,
+                        vendor: vendor,
+                        amount: 0,  // Frequency anomaly, not amount-based
+                        description: `High frequency month: ${count} transactions`,
+                        anomalyType: 'Frequency Spike',
+                        riskScore: Math.min(90, 50 + (count - meanFreq) * 5),
+                        reason: `Unusual payment frequency: ${count} transactions vs. typical ${meanFreq.toFixed(1)} per month`
                     });
                 }
-            }
+            });
         });
         
         return frequencyAnomalies;
@@ -303,33 +633,30 @@ class FraudDetectionAnalyzer {
         
         const concentrationAnomalies = [];
         
-        const totalAmount = this.data.reduce((sum, row) => sum + row.amount, 0);
-        const vendorTotals = {};
-        
-        // Calculate total amount per vendor
-        this.data.forEach(row => {
-            vendorTotals[row.vendor] = (vendorTotals[row.vendor] || 0) + row.amount;
-        });
+        // Per-vendor and overall totals come from the shared column scan
+        const { vendors } = this.columns;
+        const { vendorTotals, totalAmount } = this.getColumnScan();
         
-        // Sort vendors by total amount
-        const sortedVendors = Object.entries(vendorTotals).sort((a, b) => b[1] - a[1]);
+        const concentrations = vendorTotals.map(total => total / totalAmount);
+        const riskScores = StatUtils.clip(concentrations.map(concentration => 60 + (concentration * 100)), -Infinity, 95);
         
-        sortedVendors.forEach(([vendor, total]) => {
-            const concentration = total / totalAmount;
+        // Only vendors over the threshold matter, so filter the totals directly;
+        // ranking them isn't needed since results are ranked by risk score anyway
+        vendorTotals.forEach((total, code) => {
+            const concentration = concentrations[code];
+            if (!(concentration > concentrationThreshold)) return;
             
-            if (concentration > concentrationThreshold) {
-                const anomaly = {
-                    transactionId: `conc_${vendor}`,
-                    date: 'Overall Period',
-                    vendor: vendor,
-                    amount: total,
-                    description: `High vendor concentration: ${(concentration * 100).toFixed(1)}% of total payments`,
-                    anomalyType: 'Vendor Concentration',
-                    riskScore: Math.min(95, 60 + (concentration * 100)),
-                    reason: `Vendor receives ${(concentration * 100).toFixed(1)}% of all payments ($${total.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})} of $${totalAmount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})})`
-                };
-                concentrationAnomalies.push(anomaly);
-            }
+            const vendor = vendors[code];
+            concentrationAnomalies.push({
+                transactionId: `conc_${vendor}`,
+                date: 'Overall Period',
+                vendor: vendor,
+                amount: total,
+                description: `High vendor concentration: ${(concentration * 100).toFixed(1)}% of total payments`,
+                anomalyType: 'Vendor Concentration',
+                riskScore: riskScores[code],
+                reason: `Vendor receives ${(concentration * 100).toFixed(1)}% of all payments ($${total.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})} of $${totalAmount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})})`
+            });
         });
         
         return concentrationAnomalies;
@@ -342,14 +669,15 @@ class FraudDetectionAnalyzer {
         console.log("Detecting embezzlement patterns based on real cases...");
         
         const embezzlementAnomalies = [];
+        const { transactionId } = this.columns;
         
         // Pattern 1: Round dollar amounts (Dennis Kozlowski - Tyco case)
         // Corporate executives using company funds for personal expenses
-        this.data.forEach((row, index) => {
+        this.data.forEach((row, i) => {
             const amount = row.amount;
             if ((amount % 1000 === 0 || amount % 500 === 0) && amount >= 1000) {
                 embezzlementAnomalies.push({
-                    transactionId: row.transaction_id || `txn_${index}`,
+                    transactionId: transactionId[i],
                     date: row.date,
                     vendor: row.vendor,
                     amount: amount,
@@ -357,56 +685,59 @@ class FraudDetectionAnalyzer {
                     anomalyType: 'Round Dollar Embezzlement',
                     riskScore: 85,
                     embezzlementPattern: 'Kozlowski Pattern',
-                    reason: `Round dollar amount pattern: $${amount.toLocaleString()} (typical of corporate card abuse)`
+                    reason: undefined
                 });
             }
         });
         
         // Pattern 2: Just-under-threshold amounts (Wells Fargo patterns)
         // Staying under approval limits to avoid detection
-        const thresholds = [1000, 2500, 5000, 10000, 25000, 50000];
-        
-        this.data.forEach((row, index) => {
+        this.data.forEach((row, i) => {
             const amount = row.amount;
-            thresholds.forEach(threshold => {
-                if (amount >= (threshold - 100) && amount < threshold) {
-                    embezzlementAnomalies.push({
-                        transactionId: row.transaction_id || `txn_${index}`,
-                        date: row.date,
-                        vendor: row.vendor,
-                        amount: amount,
-                        description: row.description,
-                        anomalyType: 'Threshold Evasion Embezzlement',
-                        riskScore: 90,
-                        embezzlementPattern: 'Wells Fargo Pattern',
-                        reason: `Amount $${amount.toLocaleString()} suspiciously close to $${threshold.toLocaleString()} threshold`
-                    });
-                }
-            });
+            const threshold = evadedThreshold(amount);
+            if (threshold !== null) {
+                embezzlementAnomalies.push({
+                    transactionId: transactionId[i],
+                    date: row.date,
+                    vendor: row.vendor,
+                    amount: amount,
+                    description: row.description,
+                    anomalyType: 'Threshold Evasion Embezzlement',
+                    riskScore: 90,
+                    embezzlementPattern: 'Wells Fargo Pattern',
+                    reason: undefined,
+                    threshold: threshold
+                });
+            }
         });
         
         // Pattern 3: Frequent small amounts (Rita Crundwell - Dixon embezzlement)
         // Many small transactions to avoid detection over long periods
-        const vendorFrequency = {};
-        this.data.forEach(row => {
-            if (row.amount < 5000) {
-                if (!vendorFrequency[row.vendor]) {
-                    vendorFrequency[row.vendor] = [];
-                }
-                vendorFrequency[row.vendor].push(row);
+        // Vendors are reported in order of their first small payment, as when the
+        // small rows were grouped in a single pass over the data
+        const { vendors } = this.columns;
+        const vendorRows = this.getVendorRowIndices();
+        const smallPaymentGroups = [];
+        vendorRows.forEach((rows, code) => {
+            const smallRows = rows.filter(i => this.data[i].amount < 5000);
+            if (smallRows.length > 0) {
+                smallPaymentGroups.push({ vendor: vendors[code], smallRows });
             }
         });
+        smallPaymentGroups.sort((a, b) => a.smallRows[0] - b.smallRows[0]);
         
-        Object.entries(vendorFrequency).forEach(([vendor, transactions]) => {
-            if (transactions.length >= 15) { // Many transactions
-                const totalAmount = transactions.reduce((sum, t) => sum + t.amount, 0);
-                const avgAmount = totalAmount / transactions.length;
+        smallPaymentGroups.forEach(({ vendor, smallRows }) => {
+            if (smallRows.length >= 15) { // Many transactions
+                const totalAmount = smallRows.reduce((sum, i) => sum + this.data[i].amount, 0);
+                const avgAmount = totalAmount / smallRows.length;
                 
                 if (totalAmount > 50000 && avgAmount < 3000) {
                     // Flag the most recent transactions as suspicious
-                    transactions.slice(-3).forEach(transaction => {
+                    const byDate = Array.from(smallRows).sort((a, b) => this.data[a].date - this.data[b].date);
+                    byDate.slice(-3).forEach(i => {
+                        const transaction = this.data[i];
                         embezzlementAnomalies.push({
-                            transactionId: transaction.transaction_id,
+                            transactionId: transactionId[i],
                             date: transaction.date,
                             vendor: vendor,
                             amount: transaction.amount,
@@ -414,7 +745,7 @@ class FraudDetectionAnalyzer {
                             anomalyType: 'Structuring Embezzlement',
                             riskScore: 95,
                             embezzlementPattern: 'Crundwell Pattern',
-                            reason: `Potential structuring: ${transactions.length} small payments totaling $${totalAmount.toLocaleString()}`
+                            reason: `Potential structuring: ${smallRows.length} small payments totaling $${totalAmount.toLocaleString()}`
                         });
                     });
                 }
@@ -423,25 +754,25 @@ class FraudDetectionAnalyzer {
         
         // Pattern 4: Similar vendor names (Frank Abagnale techniques)
         // Multiple vendors with similar names that could be the same entity
-        const vendorNames = [...new Set(this.data.map(row => row.vendor))];
         const suspiciousVendorPairs = [];
         
-        for (let i = 0; i < vendorNames.length; i++) {
-            for (let j = i + 1; j < vendorNames.length; j++) {
-                const similarity = this.calculateStringSimilarity(vendorNames[i], vendorNames[j]);
+        for (let i = 0; i < vendors.length; i++) {
+            for (let j = i + 1; j < vendors.length; j++) {
+                const similarity = this.calculateStringSimilarity(vendors[i], vendors[j]);
                 if (similarity > 0.75 && similarity < 1.0) {
-                    suspiciousVendorPairs.push([vendorNames[i], vendorNames[j], similarity]);
+                    suspiciousVendorPairs.push([i, j, similarity]);
                 }
             }
         }
         
-        suspiciousVendorPairs.forEach(([vendor1, vendor2, similarity]) => {
-            const transactions1 = this.data.filter(row => row.vendor === vendor1);
-            const transactions2 = this.data.filter(row => row.vendor === vendor2);
+        suspiciousVendorPairs.forEach(([code1, code2, similarity]) => {
+            const vendor1 = vendors[code1];
+            const vendor2 = vendors[code2];
             
-            [...transactions1, ...transactions2].forEach(transaction => {
+            [...vendorRows[code1], ...vendorRows[code2]].forEach(i => {
+                const transaction = this.data[i];
                 embezzlementAnomalies.push({
-                    transactionId: transaction.transaction_id,
+                    transactionId: transactionId[i],
                     date: transaction.date,
                     vendor: transaction.vendor,
                     amount: transaction.amount,
@@ -456,10 +787,9 @@ class FraudDetectionAnalyzer {
         
         // Pattern 5: Off-hours transactions (Enron energy trading)
         // Large transactions during times with minimal oversight
-        this.data.forEach((row, index) => {
-            const date = new Date(row.date);
-            const hour = date.getHours();
-            const day = date.getDay();
+        this.data.forEach((row, i) => {
+            const hour = row.date.getHours();
+            const day = row.date.getDay();
             const amount = row.amount;
             
             const isWeekend = day === 0 || day === 6;
@@ -468,7 +798,7 @@ class FraudDetectionAnalyzer {
             
             if ((isWeekend || isAfterHours) && isLargeAmount) {
                 embezzlementAnomalies.push({
-                    transactionId: row.transaction_id || `txn_${index}`,
+                    transactionId: transactionId[i],
                     date: row.date,
                     vendor: row.vendor,
                     amount: amount,
@@ -476,7 +806,7 @@ class FraudDetectionAnalyzer {
                     anomalyType: 'Off-Hours Embezzlement',
                     riskScore: 85,
                     embezzlementPattern: 'Enron Pattern',
-                    reason: `Large transaction during off-hours: $${amount.toLocaleString()} on ${date.toLocaleDateString()} at ${hour}:00`
+                    reason: undefined
                 });
             }
         });
@@ -493,35 +823,47 @@ class FraudDetectionAnalyzer {
         const kickbackAnomalies = [];
         
         // Look for consulting/advisory transactions
-        const consultingTransactions = this.data.filter(row => {
-            const desc = row.description.toLowerCase();
-            const category = row.category ? row.category.toLowerCase() : '';
-            
+        // Match each distinct description/category once, then select rows by code
+        const { descriptionCode, descriptions, categoryCode, categories, transactionId } = this.columns;
+        const consultingDescription = descriptions.map(description => {
+            const desc = description.toLowerCase();
             return desc.includes('consulting') || desc.includes('advisory') || 
-                   desc.includes('commission') || desc.includes('referral') ||
-                   category.includes('consulting') || category.includes('advisory');
+                   desc.includes('commission') || desc.includes('referral');
+        });
+        const consultingCategory = categories.map(value => {
+            const category = value ? value.toLowerCase() : '';
+            return category.includes('consulting') || category.includes('advisory');
         });
         
-        if (consultingTransactions.length > 0) {
-            // Group by vendor
+        const consultingRows = [];
+        for (let i = 0; i < this.data.length; i++) {
+            if (consultingDescription[descriptionCode[i]] || consultingCategory[categoryCode[i]]) {
+                consultingRows.push(i);
+            }
+        }
+        
+        if (consultingRows.length > 0) {
+            // Group row indices by vendor
             const consultingVendors = {};
-            consultingTransactions.forEach(transaction => {
-                if (!consultingVendors[transaction.vendor]) {
-                    consultingVendors[transaction.vendor] = [];
+            consultingRows.forEach(i => {
+                const vendor = this.data[i].vendor;
+                if (!consultingVendors[vendor]) {
+                    consultingVendors[vendor] = [];
                 }
-                consultingVendors[transaction.vendor].push(transaction);
+                consultingVendors[vendor].push(i);
             });
             
             // Analyze each consulting vendor
-            Object.entries(consultingVendors).forEach(([vendor, transactions]) => {
-                const totalAmount = transactions.reduce((sum, t) => sum + t.amount, 0);
-                const avgAmount = totalAmount / transactions.length;
+            Object.entries(consultingVendors).forEach(([vendor, rows]) => {
+                const totalAmount = rows.reduce((sum, i) => sum + this.data[i].amount, 0);
+                const avgAmount = totalAmount / rows.length;
                 
                 // Pattern 1: High-value, low-volume consulting (potential kickbacks)
-                if (totalAmount > 100000 && transactions.length < 10 && avgAmount > 15000) {
-                    transactions.forEach(transaction => {
+                if (totalAmount > 100000 && rows.length < 10 && avgAmount > 15000) {
+                    rows.forEach(i => {
+                        const transaction = this.data[i];
                         kickbackAnomalies.push({
-                            transactionId: transaction.transaction_id,
+                            transactionId: transactionId[i],
                             date: transaction.date,
                             vendor: vendor,
                             amount: transaction.amount,
@@ -535,14 +877,16 @@ class FraudDetectionAnalyzer {
                 }
                 
                 // Pattern 2: Round percentage amounts (common in kickback schemes)
-                const roundAmounts = transactions.filter(t => 
-                    t.amount % 250 === 0 || t.amount % 500 === 0 || t.amount % 1000 === 0
-                );
+                const roundRows = rows.filter(i => {
+                    const amount = this.data[i].amount;
+                    return amount % 250 === 0 || amount % 500 === 0 || amount % 1000 === 0;
+                });
                 
-                if (roundAmounts.length / transactions.length > 0.7) {
-                    roundAmounts.forEach(transaction => {
+                if (roundRows.length / rows.length > 0.7) {
+                    roundRows.forEach(i => {
+                        const transaction = this.data[i];
                         kickbackAnomalies.push({
-                            transactionId: transaction.transaction_id,
+                            transactionId: transactionId[i],
                             date: transaction.date,
                             vendor: vendor,
                             amount: transaction.amount,
@@ -556,7 +900,8 @@ class FraudDetectionAnalyzer {
                 }
                 
                 // Pattern 3: Consulting payments immediately after large contracts
-                transactions.forEach(consultingTransaction => {
+                rows.forEach(i => {
+                    const consultingTransaction = this.data[i];
                     const consultingDate = new Date(consultingTransaction.date);
                     
                     // Look for large contracts within 30 days before this consulting payment
@@ -571,7 +916,7 @@ class FraudDetectionAnalyzer {
                     
                     if (recentLargeTransactions.length > 0) {
                         kickbackAnomalies.push({
-                            transactionId: consultingTransaction.transaction_id,
+                            transactionId: transactionId[i],
                             date: consultingTransaction.date,
                             vendor: vendor,
                             amount: consultingTransaction.amount,
@@ -635,51 +980,67 @@ class FraudDetectionAnalyzer {
     
     /**
      * Run all anomaly detection methods and return combined results
+     * 
+     * Results are in detector order; printSummary picks the top entries and
+     * exportResults writes them ranked by risk score. Row-level records may have
+     * `reason === undefined` (see REASON_FORMATTERS): read the text through
+     * formatAnomalyReason rather than the `reason` field.
      */
     runFullAnalysis() {
-        console.log("\n🔍 Running Enhanced Fraud Detection Analysis...");
-        console.log(`📊 Analyzing ${this.data.length} transactions across ${new Set(this.data.map(row => row.vendor)).size} vendors`);
+        // Rows may have been edited since loading, and the fingerprint below is
+        // hashed from the columns, so rebuild them from the rows as they are now
+        this.refreshColumns();
         
-        const minDate = new Date(Math.min(...this.data.map(row => row.date)));
-        const maxDate = new Date(Math.max(...this.data.map(row => row.date)));
-        const totalAmount = this.data.reduce((sum, row) => sum + row.amount, 0);
+        console.log("\n🔍 Running Enhanced Fraud Detection Analysis...");
+        console.log(`📊 Analyzing ${this.data.length} transactions across ${this.columns.vendors.length} vendors`);
+        
+        // Plain loops rather than Math.min(...rows), which overflows the call stack on large inputs
+        const { time, amount } = this.columns;
+        let minTime = Infinity;
+        let maxTime = -Infinity;
+        let totalAmount = 0;
+        for (let i = 0; i < time.length; i++) {
+            if (time[i] < minTime) minTime = time[i];
+            if (time[i] > maxTime) maxTime = time[i];
+            totalAmount += amount[i];
+        }
+        const minDate = new Date(minTime);
+        const maxDate = new Date(maxTime);
         
         console.log(`📅 Date range: ${minDate.toDateString()} to ${maxDate.toDateString()}`);
         console.log(`💰 Total amount: $${totalAmount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}`);
         console.log("-".repeat(60));
         
-        // Compute vendor statistics first
-        this.computeVendorStatistics();
-        
-        // Run all detection methods
-        const allAnomalies = [];
-        
-        // 1. Statistical outliers (mean + 3σ)
-        const outliers = this.detectStatisticalOutliers();
-        allAnomalies.push(...outliers);
-        
-        // 2. Round dollar patterns and threshold evasion
-        const roundPatterns = this.detectRoundDollarPatterns();
-        allAnomalies.push(...roundPatterns);
-        
-        // 3. Frequency anomalies
-        const freqAnomalies = this.detectFrequencyAnomalies();
-        allAnomalies.push(...freqAnomalies);
-        
-        // 4. Vendor concentration
-        const concAnomalies = this.detectVendorConcentration();
-        allAnomalies.push(...concAnomalies);
-        
-        // 5. Embezzlement pattern detection
-        const embezzlementAnomalies = this.detectEmbezzlementPatterns();
-        allAnomalies.push(...embezzlementAnomalies);
+        // Re-analyzing identical input (dashboard refreshes, repeated demos) reuses the earlier result
+        const fingerprint = this.computeFingerprint();
+        const cached = analysisCache.get(fingerprint);
+        if (cached) {
+            console.log("♻️  Input unchanged since a previous analysis - reusing cached results");
+            analysisCache.delete(fingerprint);
+            analysisCache.set(fingerprint, cached);
+            // Restore a fresh copy, so changes made by one caller never reach later hits
+            const { anomalies, vendorStats, vendorStatsTable } = structuredClone(cached);
+            this.vendorStats = vendorStats;
+            this.vendorStatsTable = vendorStatsTable;
+            this.columnScan = null;
+            this.anomalies = anomalies;
+            return this.anomalies;
+        }
         
-        // 6. Kickback scheme detection
-        const kickbackAnomalies = this.detectKickbackSchemes();
-        allAnomalies.push(...kickbackAnomalies);
+        // Compute vendor statistics first, then run all detection methods in order
+        this.computeVendorStatistics();
+        const allAnomalies = [].concat(...DETECTORS.map(detector => this[detector]()));
         
-        // Sort by risk score (highest first)
-        allAnomalies.sort((a, b) => b.riskScore - a.riskScore);
+        if (analysisCache.size >= ANALYSIS_CACHE_MAX_SIZE) {
+            analysisCache.delete(analysisCache.keys().next().value);
+        }
+        // Cache a deep copy: the records returned here (and their row Dates) stay
+        // the caller's to modify
+        analysisCache.set(fingerprint, structuredClone({
+            anomalies: allAnomalies,
+            vendorStats: this.vendorStats,
+            vendorStatsTable: this.vendorStatsTable
+        }));
         
         this.anomalies = allAnomalies;
         return allAnomalies;
@@ -717,30 +1078,49 @@ class FraudDetectionAnalyzer {
         console.log("TOP 10 HIGHEST RISK ANOMALIES");
         console.log("=".repeat(80));
         
-        for (let i = 0; i < Math.min(10, this.anomalies.length); i++) {
-            const anomaly = this.anomalies[i];
+        topByRiskScore(this.anomalies, 10).forEach((anomaly, i) => {
             console.log(`\n[${i+1}] RISK SCORE: ${Math.round(anomaly.riskScore)}/100`);
             console.log(`    📅 Date: ${anomaly.date instanceof Date ? anomaly.date.toDateString() : anomaly.date}`);
             console.log(`    🏢 Vendor: ${anomaly.vendor}`);
             console.log(`    💰 Amount: $${anomaly.amount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}`);
             console.log(`    📝 Description: ${anomaly.description}`);
             console.log(`    🚩 Type: ${anomaly.anomalyType}`);
-            console.log(`    ⚠️  Reason: ${anomaly.reason}`);
-        }
+            console.log(`    ⚠️  Reason: ${formatAnomalyReason(anomaly)}`);
+        });
     }
     
     /**
      * Export anomaly results to JSON file
+     * 
+     * Records are streamed to the file in batches, so memory stays bounded by the
+     * batch rather than a JSON string of the whole result set. The output is the
+     * same as JSON.stringify(anomalies, null, 2). `batchSize` must be a positive
+     * integer.
      */
-    exportResults(filename = "fraud_anomalies.json") {
+    exportResults(filename = "fraud_anomalies.json", batchSize = 1000) {
+        if (!Number.isInteger(batchSize) || batchSize < 1) {
+            throw new RangeError(`batchSize must be a positive integer, got ${batchSize}`);
+        }
+        
         if (this.anomalies.length > 0) {
-            // Convert dates to strings for JSON serialization
-            const exportData = this.anomalies.map(anomaly => ({
-                ...anomaly,
-                date: anomaly.date instanceof Date ? anomaly.date.toISOString() : anomaly.date
-            }));
-            
-            fs.writeFileSync(filename, JSON.stringify(exportData, null, 2));
+            // Rank by risk score (highest first) and serialize the records directly;
+            // Date#toJSON already emits ISO strings, so no converted copy is needed
+            const ranked = [...this.anomalies].sort((a, b) => b.riskScore - a.riskScore);
+            const fd = fs.openSync(filename, 'w');
+            try {
+                for (let start = 0; start < ranked.length; start += batchSize) {
+                    const batch = ranked.slice(start, start + batchSize)
+                        .map(anomaly => anomaly.reason === undefined
+                            ? { ...anomaly, reason: formatAnomalyReason(anomaly) }
+                            : anomaly)
+                        .map(anomaly => '  ' + JSON.stringify(anomaly, null, 2).replace(/\n/g, '\n  '))
+                        .join(',\n');
+                    fs.writeSync(fd, (start === 0 ? '[\n' : ',\n') + batch);
+                }
+                fs.writeSync(fd, '\n]');
+            } finally {
+                fs.closeSync(fd);
+            }
             console.log(`\n💾 Results exported to ${filename}`);
         } else {
             console.log("No anomalies to export.");
@@ -751,9 +1131,21 @@ class FraudDetectionAnalyzer {
 /**
  * Generate realistic sample transaction data with embedded fraud patterns
  */
-function generateSampleData() {
+function generateSampleData(scale = 1) {
     console.log("📊 Generating sample transaction data with embedded fraud patterns...");
     
+    // Dates are N days before today; each distinct N is computed and formatted once
+    const today = new Date();
+    const isoDates = [];
+    const isoDateDaysAgo = daysAgo => {
+        if (isoDates[daysAgo] === undefined) {
+            const date = new Date(today);
+            date.setDate(date.getDate() - daysAgo);
+            isoDates[daysAgo] = date.toISOString().split('T')[0];
+        }
+        return isoDates[daysAgo];
+    };
+    
     const vendors = [
         "Office Supplies Inc", "Tech Solutions LLC", "Catering Services", 
         "Legal Associates", "Marketing Agency", "Facility Management",
@@ -788,8 +1180,9 @@ function generateSampleData() {
             variation = 400;
         }
         
-        // Generate 15-25 normal transactions per vendor
-        const numTransactions = Math.floor(Math.random() * 11) + 15;  // 15-25
+        // Generate 15-25 normal transactions per vendor (times `scale` for stress testing)
+        const numTransactions = (Math.floor(Math.random() * 11) + 15) * scale;  // 15-25
+        const description = `Services from ${vendor}`;
         
         for (let j = 0; j < numTransactions; j++) {
             // Normal distribution around base amount (approximated)
@@ -797,15 +1190,13 @@ function generateSampleData() {
             
             // Random date in the last 6 months
             const daysAgo = Math.floor(Math.random() * 180);
-            const date = new Date();
-            date.setDate(date.getDate() - daysAgo);
             
             transactions.push({
                 transaction_id: `TXN${String(transactions.length + 1).padStart(4, '0')}`,
-                date: date.toISOString().split('T')[0],
+                date: isoDateDaysAgo(daysAgo),
                 vendor: vendor,
                 amount: Math.round(amount * 100) / 100,
-                description: `Services from ${vendor}`,
+                description: description,
                 payment_method: paymentMethods[Math.floor(Math.random() * paymentMethods.length)]
             });
         }
@@ -819,12 +1210,10 @@ function generateSampleData() {
     for (let i = 0; i < 8; i++) {
         const amount = 800 + (Math.random() - 0.5) * 400;  // ~600-1000
         const daysAgo = Math.floor(Math.random() * 120) + 30;
-        const date = new Date();
-        date.setDate(date.getDate() - daysAgo);
         
         transactions.push({
             transaction_id: `TXN${String(transactions.length + 1).padStart(4, '0')}`,
-            date: date.toISOString().split('T')[0],
+            date: isoDateDaysAgo(daysAgo),
             vendor: fraudVendor,
             amount: Math.round(amount * 100) / 100,
             description: `Regular services from ${fraudVendor}`,
@@ -836,12 +1225,10 @@ function generateSampleData() {
     const outlierAmounts = [15000, 22500, 18750];  // Way above normal ~$800
     outlierAmounts.forEach(amount => {
         const daysAgo = Math.floor(Math.random() * 60);
-        const date = new Date();
-        date.setDate(date.getDate() - daysAgo);
         
         transactions.push({
             transaction_id: `TXN${String(transactions.length + 1).padStart(4, '0')}`,
-            date: date.toISOString().split('T')[0],
+            date: isoDateDaysAgo(daysAgo),
             vendor: fraudVendor,
             amount: amount,
             description: `Special project payment - ${fraudVendor}`,
@@ -854,12 +1241,10 @@ function generateSampleData() {
     const roundAmounts = [5000, 10000, 15000, 7500, 12500];
     roundAmounts.forEach(amount => {
         const daysAgo = Math.floor(Math.random() * 80) + 10;
-        const date = new Date();
-        date.setDate(date.getDate() - daysAgo);
         
         transactions.push({
             transaction_id: `TXN${String(transactions.length + 1).padStart(4, '0')}`,
-            date: date.toISOString().split('T')[0],
+            date: isoDateDaysAgo(daysAgo),
             vendor: shellVendor,
             amount: amount,
             description: "Consulting services - exact amount",
@@ -873,12 +1258,10 @@ function generateSampleData() {
     const evasionAmounts = [4999, 9999, 4950, 9900, 4999, 24999];
     evasionAmounts.forEach(amount => {
         const daysAgo = Math.floor(Math.random() * 115) + 5;
-        const date = new Date();
-        date.setDate(date.getDate() - daysAgo);
         
         transactions.push({
             transaction_id: `TXN${String(transactions.length + 1).padStart(4, '0')}`,
-            date: date.toISOString().split('T')[0],
+            date: isoDateDaysAgo(daysAgo),
             vendor: thresholdVendor,
             amount: amount,
             description: "Equipment purchase - just under limit",
@@ -891,12 +1274,10 @@ function generateSampleData() {
     for (let i = 0; i < 15; i++) {  // 15 extra transactions = suspicious frequency
         const amount = Math.random() * 400 + 200;  // 200-600
         const daysAgo = Math.floor(Math.random() * 30);  // All in last month
-        const date = new Date();
-        date.setDate(date.getDate() - daysAgo);
         
         transactions.push({
             transaction_id: `TXN${String(transactions.length + 1).padStart(4, '0')}`,
-            date: date.toISOString().split('T')[0],
+            date: isoDateDaysAgo(daysAgo),
             vendor: "Office Supplies Inc",
             amount: Math.round(amount * 100) / 100,
             description: "Small office supplies order",
@@ -910,12 +1291,10 @@ function generateSampleData() {
     const kozlowskiAmounts = [5000, 10000, 15000, 8000, 12000];
     kozlowskiAmounts.forEach(amount => {
         const daysAgo = Math.floor(Math.random() * 90) + 10;
-        const date = new Date();
-        date.setDate(date.getDate() - daysAgo);
         
         transactions.push({
             transaction_id: `TXN${String(transactions.length + 1).padStart(4, '0')}`,
-            date: date.toISOString().split('T')[0],
+            date: isoDateDaysAgo(daysAgo),
             vendor: embezzlementVendor,
             amount: amount,
             description: "Executive consulting services",
@@ -968,12 +1347,10 @@ function generateSampleData() {
     similarVendors.forEach((vendor, index) => {
         const amount = 8500 + (index * 1000); // 8500, 9500, 10500
         const daysAgo = Math.floor(Math.random() * 60) + 10;
-        const date = new Date();
-        date.setDate(date.getDate() - daysAgo);
         
         transactions.push({
             transaction_id: `TXN${String(transactions.length + 1).padStart(4, '0')}`,
-            date: date.toISOString().split('T')[0],
+            date: isoDateDaysAgo(daysAgo),
             vendor: vendor,
             amount: amount,
             description: "Business consulting services",
@@ -1010,12 +1387,13 @@ function generateSampleData() {
 }
 
 // Main execution
-// Demo the fraud detection system
-console.log("🔍 Oqualtix Enhanced Fraud Detection Analyzer");
-console.log("=".repeat(50));
-
-// Generate sample data with embedded fraud
-const sampleData = generateSampleData();
+// Demo the fraud detection system (only when run directly, not when imported)
+if (process.argv[1] && path.basename(process.argv[1], '.js') === 'fraud_detection_analyzer') {
+    console.log("🔍 Oqualtix Enhanced Fraud Detection Analyzer");
+    console.log("=".repeat(50));
+    
+    // Generate sample data with embedded fraud
+    const sampleData = generateSampleData();
     
     // Initialize analyzer
     const analyzer = new FraudDetectionAnalyzer(3.0, 5);
@@ -1032,5 +1410,6 @@ const sampleData = generateSampleData();
     
     console.log(`\n✅ Analysis complete! Found ${anomalies.length} potential fraud indicators.`);
     console.log("💡 This demonstrates the Enhanced Anomaly Detection system used in the Oqualtix app.");
+}
 
-export { FraudDetectionAnalyzer, StatUtils, generateSampleData };
\ No newline at end of file
+export { FraudDetectionAnalyzer, StatUtils, clearAnalysisCache, formatAnomalyReason, generateSampleData, topByRiskScore };
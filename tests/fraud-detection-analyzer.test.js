@@ -0,0 +1,661 @@
+/**
+ * Fraud Detection Analyzer Tests
+ * Covers the analyzer's detectors, caching and ranking/export helpers
+ */
+
+// Sample dates parse as UTC midnights; pin the zone so the hour- and month-based
+// detectors see the same values as when the seeded baseline was recorded
+process.env.TZ = 'UTC';
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const {
+  FraudDetectionAnalyzer,
+  StatUtils,
+  clearAnalysisCache,
+  formatAnomalyReason,
+  generateSampleData,
+  topByRiskScore
+} = require('../fraud_detection_analyzer');
+
+// A transaction row with every column loadData requires
+const makeRow = (vendor, amount, date = '2024-03-15T10:00:00', extra = {}) => ({
+  date,
+  amount,
+  vendor,
+  description: 'Office supplies',
+  payment_method: 'ACH',
+  category: 'Supplies',
+  ...extra
+});
+
+const loadAnalyzer = (rows, options) => {
+  const analyzer = new FraudDetectionAnalyzer();
+  analyzer.loadData(null, rows, options);
+  return analyzer;
+};
+
+// The analyzer reports progress on the console
+beforeAll(() => {
+  jest.spyOn(console, 'log').mockImplementation(() => {});
+});
+
+afterAll(() => {
+  console.log.mockRestore();
+});
+
+// Anomalies with heavily tied risk scores, tagged with their list position
+const tiedAnomalies = Array.from({ length: 200 }, (_, i) => ({
+  id: i,
+  riskScore: [95, 70, 85, 70, 40][i % 5] + (i % 7 === 0 ? 0.5 : 0)
+}));
+
+describe('topByRiskScore', () => {
+  const stableRanking = [...tiedAnomalies].sort((a, b) => b.riskScore - a.riskScore);
+
+  test.each([0, 1, 3, 10, 57, 200, 250])('top %i matches a stable sort, ties in list order', k => {
+    const top = topByRiskScore(tiedAnomalies, k);
+
+    expect(top.map(anomaly => anomaly.id)).toEqual(stableRanking.slice(0, k).map(anomaly => anomaly.id));
+  });
+
+  test('Returns the original records', () => {
+    const [first] = topByRiskScore(tiedAnomalies, 1);
+
+    expect(tiedAnomalies).toContain(first);
+  });
+});
+
+describe('Vendor statistics', () => {
+  // Summing these in sorted order gives a different last digit than in row order
+  const acmeAmounts = [0.1, 0.2, 0.3, 0.7, 0.4, 0.6];
+  let analyzer;
+
+  beforeAll(() => {
+    analyzer = loadAnalyzer([
+      ...acmeAmounts.map(amount => makeRow('Acme', amount)),
+      makeRow('Tiny Co', 50),
+      makeRow('Tiny Co', 60)
+    ]);
+    analyzer.computeVendorStatistics();
+  });
+
+  test('Mean and std are taken over the amounts in row order', () => {
+    const acme = analyzer.vendorStats.Acme;
+
+    expect(acme.mean).toBe(StatUtils.mean(acmeAmounts));
+    expect(acme.std).toBe(StatUtils.stdev(acmeAmounts));
+    expect(acme.threshold3Sigma).toBe(acme.mean + 3 * acme.std);
+  });
+
+  test('Order statistics come from the sorted amounts', () => {
+    const acme = analyzer.vendorStats.Acme;
+
+    expect(acme.count).toBe(6);
+    expect(acme.min).toBe(0.1);
+    expect(acme.max).toBe(0.7);
+    expect(acme.median).toBe(StatUtils.median(acmeAmounts));
+    expect(acme.q25).toBe(StatUtils.quantile(acmeAmounts, 0.25));
+    expect(acme.q75).toBe(StatUtils.quantile(acmeAmounts, 0.75));
+    expect(acme.iqr).toBe(acme.q75 - acme.q25);
+  });
+
+  test('The stats table holds the same values, indexed by vendor code', () => {
+    const table = analyzer.vendorStatsTable;
+    const code = table.vendors.indexOf('Acme');
+
+    Object.entries(analyzer.vendorStats.Acme).forEach(([field, value]) => {
+      expect(table[field][code]).toBe(value);
+    });
+  });
+
+  test('Vendors below minTransactions get no stats and an Infinity threshold', () => {
+    const table = analyzer.vendorStatsTable;
+    const code = table.vendors.indexOf('Tiny Co');
+
+    expect(analyzer.vendorStats['Tiny Co']).toBeUndefined();
+    expect(table.count[code]).toBe(0);
+    expect(table.mean[code]).toBeNaN();
+    expect(table.threshold3Sigma[code]).toBe(Infinity);
+  });
+});
+
+describe('Round dollar patterns', () => {
+  const amounts = [1000, 2000, 5000, 12300, 900, 1050, 1000.004, 4999.9999, 2000.01];
+  let round;
+
+  beforeAll(() => {
+    const analyzer = loadAnalyzer(amounts.map(amount => makeRow('Acme', amount)));
+    round = analyzer.detectRoundDollarPatterns()
+      .filter(anomaly => anomaly.anomalyType === 'Round Dollar Pattern')
+      .map(anomaly => anomaly.amount);
+  });
+
+  test('Whole hundreds from $1,000 up are round', () => {
+    expect(round).toEqual([1000, 2000, 5000, 12300]);
+  });
+
+  test.each([1000.004, 4999.9999, 2000.01])('%p is not round', amount => {
+    expect(round).not.toContain(amount);
+  });
+});
+
+describe('loadData', () => {
+  const unsortedRows = () => [
+    makeRow('Acme', 100, '2024-03-20'),
+    makeRow('Globex', 200, '2024-01-05'),
+    makeRow('Initech', 300, '2024-02-11')
+  ];
+
+  test('Keeps input order unless sort is set', () => {
+    const rows = unsortedRows();
+    const analyzer = loadAnalyzer(rows);
+
+    expect(analyzer.data).toBe(rows);
+    expect(analyzer.data.map(row => row.vendor)).toEqual(['Acme', 'Globex', 'Initech']);
+  });
+
+  test('sort orders a copy by date and leaves the caller\'s array alone', () => {
+    const rows = unsortedRows();
+    const [acme, globex, initech] = rows;
+    const analyzer = loadAnalyzer(rows, { sort: true });
+
+    expect(analyzer.data).not.toBe(rows);
+    expect(analyzer.data).toEqual([globex, initech, acme]);
+    expect(rows).toEqual([acme, globex, initech]);
+    expect(Array.from(analyzer.columns.amount)).toEqual([200, 300, 100]);
+  });
+
+  test('Parses date strings on the caller\'s rows by default', () => {
+    const rows = unsortedRows();
+    loadAnalyzer(rows);
+
+    expect(rows[0].date).toBeInstanceOf(Date);
+    expect(rows[0].date.getTime()).toBe(new Date('2024-03-20').getTime());
+  });
+
+  test('copy leaves the caller\'s rows untouched', () => {
+    const rows = unsortedRows();
+    const original = JSON.parse(JSON.stringify(rows));
+    const analyzer = loadAnalyzer(rows, { copy: true, sort: true });
+
+    expect(rows).toEqual(original);
+    expect(analyzer.data.map(row => row.date)).toEqual([
+      new Date('2024-01-05'),
+      new Date('2024-02-11'),
+      new Date('2024-03-20')
+    ]);
+  });
+});
+
+describe('refreshColumns', () => {
+  test('Detectors see row edits made before a refresh', () => {
+    const analyzer = loadAnalyzer(Array.from({ length: 6 }, (_, i) => makeRow('Acme', 120 + i)));
+    analyzer.computeVendorStatistics();
+    expect(analyzer.detectRoundDollarPatterns()).toEqual([]);
+
+    analyzer.data.forEach(row => { row.amount = 5000; });
+    analyzer.data.push(makeRow('Globex', 7000, new Date('2024-03-16')));
+    analyzer.refreshColumns();
+
+    expect(analyzer.vendorStatsTable).toBeNull();
+    expect(analyzer.vendorStats).toEqual({});
+    expect(analyzer.getVendorRowIndices()).toHaveLength(2);
+    expect(analyzer.detectRoundDollarPatterns()
+      .filter(anomaly => anomaly.anomalyType === 'Round Dollar Pattern')
+      .map(anomaly => anomaly.amount)).toEqual([5000, 5000, 5000, 5000, 5000, 5000, 7000]);
+  });
+});
+
+describe('Analysis cache', () => {
+  // Distinct inputs for distinct `seed` values
+  const cacheRows = (seed = 0) => Array.from({ length: 8 }, (_, i) => makeRow(
+    i % 2 ? 'Acme' : 'Globex',
+    100 + seed + i * 37.5,
+    `2024-03-${String(i + 1).padStart(2, '0')}T10:00:00`
+  ));
+
+  const analyze = rows => loadAnalyzer(rows).runFullAnalysis();
+  const wasCacheHit = () => console.log.mock.calls.some(([message]) => String(message).includes('reusing cached results'));
+
+  beforeEach(() => {
+    clearAnalysisCache();
+    console.log.mockClear();
+  });
+
+  test('Identical input reuses the earlier result', () => {
+    const first = analyze(cacheRows());
+    expect(wasCacheHit()).toBe(false);
+
+    const second = analyze(cacheRows());
+    expect(wasCacheHit()).toBe(true);
+    expect(second).toEqual(first);
+  });
+
+  test('Hits return private copies of the records', () => {
+    // A round amount, so some records carry a row Date
+    const roundRows = () => cacheRows().map((row, i) => (i === 0 ? { ...row, amount: 5000 } : row));
+    const first = analyze(roundRows());
+    const expected = JSON.parse(JSON.stringify(first));
+    first[0].riskScore = -1;
+    first.find(anomaly => anomaly.date instanceof Date).date.setFullYear(1999);
+
+    const second = analyze(roundRows());
+    expect(wasCacheHit()).toBe(true);
+    expect(JSON.parse(JSON.stringify(second))).toEqual(expected);
+
+    second.length = 0;
+    expect(JSON.parse(JSON.stringify(analyze(roundRows())))).toEqual(expected);
+  });
+
+  test('Editing the rows after loading is a cache miss', () => {
+    const analyzer = loadAnalyzer(cacheRows());
+    analyzer.runFullAnalysis();
+    console.log.mockClear();
+
+    analyzer.data.forEach(row => { row.amount = 5000; });
+    const anomalies = analyzer.runFullAnalysis();
+
+    expect(wasCacheHit()).toBe(false);
+    expect(anomalies.filter(anomaly => anomaly.anomalyType === 'Round Dollar Pattern')).toHaveLength(8);
+  });
+
+  test('Keeps the 16 most recently used results', () => {
+    for (let seed = 0; seed <= 16; seed++) {
+      analyze(cacheRows(seed));
+    }
+
+    console.log.mockClear();
+    analyze(cacheRows(16));
+    expect(wasCacheHit()).toBe(true);
+
+    console.log.mockClear();
+    analyze(cacheRows(0));
+    expect(wasCacheHit()).toBe(false);
+  });
+
+  test('clearAnalysisCache drops every result', () => {
+    analyze(cacheRows());
+    clearAnalysisCache();
+    console.log.mockClear();
+
+    analyze(cacheRows());
+    expect(wasCacheHit()).toBe(false);
+  });
+});
+
+describe('Reloading data', () => {
+  const steadyRows = (vendor, amount) => Array.from({ length: 10 }, () => makeRow(vendor, amount));
+
+  test('Outlier detection finds nothing before vendor statistics exist', () => {
+    const analyzer = loadAnalyzer([...steadyRows('Acme', 100), makeRow('Acme', 90000)]);
+
+    expect(analyzer.detectStatisticalOutliers()).toEqual([]);
+  });
+
+  test('Drops the previous data\'s vendor statistics', () => {
+    const analyzer = loadAnalyzer(steadyRows('Acme', 100));
+    analyzer.computeVendorStatistics();
+
+    // Globex takes over vendor code 0, which Acme's stats would flag at 5000
+    analyzer.loadData(null, [...steadyRows('Globex', 5000), ...steadyRows('Acme', 100)]);
+
+    expect(analyzer.vendorStatsTable).toBeNull();
+    expect(analyzer.vendorStats).toEqual({});
+    expect(analyzer.detectStatisticalOutliers()).toEqual([]);
+
+    analyzer.computeVendorStatistics();
+    expect(Object.keys(analyzer.vendorStats)).toEqual(['Globex', 'Acme']);
+    expect(analyzer.detectStatisticalOutliers()).toEqual([]);
+  });
+});
+
+describe('StatUtils.searchSorted', () => {
+  test.each([
+    [0, 0],
+    [1, 1],
+    [2, 4],
+    [3, 4],
+    [5, 5],
+    [6, 5]
+  ])('Insertion point for %p is after any equal entries (%p)', (value, index) => {
+    expect(StatUtils.searchSorted([1, 2, 2, 2, 5], value)).toBe(index);
+  });
+
+  test('Works on typed arrays and empty input', () => {
+    expect(StatUtils.searchSorted(Float64Array.of(1000, 2500, 5000), 2499.99)).toBe(1);
+    expect(StatUtils.searchSorted(Float64Array.of(1000, 2500, 5000), 2500)).toBe(2);
+    expect(StatUtils.searchSorted([], 10)).toBe(0);
+  });
+});
+
+describe('Threshold evasion', () => {
+  test('Flags amounts within $100 under the next approval threshold', () => {
+    const amounts = [899.99, 900, 999.99, 1000, 2400, 2450, 4999.99, 9950, 49901, 50000, 60000];
+    const analyzer = loadAnalyzer(amounts.map(amount => makeRow('Acme', amount)));
+    const evasion = analyzer.detectRoundDollarPatterns()
+      .filter(anomaly => anomaly.anomalyType === 'Threshold Evasion')
+      .map(anomaly => [anomaly.amount, anomaly.threshold]);
+
+    expect(evasion).toEqual([
+      [900, 1000],
+      [999.99, 1000],
+      [2400, 2500],
+      [2450, 2500],
+      [4999.99, 5000],
+      [9950, 10000],
+      [49901, 50000]
+    ]);
+  });
+});
+
+describe('Frequency anomalies', () => {
+  // Six quiet months and a 12-transaction spike in July
+  const monthRows = () => [
+    ...[1, 2, 3, 4, 5, 6].map(month => makeRow('Acme', 100, `2024-0${month}-10T10:00:00`)),
+    ...Array.from({ length: 12 }, () => makeRow('Acme', 100, '2024-07-10T10:00:00'))
+  ];
+
+  test('Flags the spike month', () => {
+    const spikes = loadAnalyzer(monthRows()).detectFrequencyAnomalies();
+
+    expect(spikes.map(anomaly => anomaly.date)).toEqual(['2024-07']);
+    expect(spikes[0].description).toBe('High frequency month: 12 transactions');
+  });
+
+  test('Rows with invalid dates are not counted in any month', () => {
+    const analyzer = loadAnalyzer([
+      ...monthRows(),
+      ...Array.from({ length: 30 }, () => makeRow('Acme', 100, 'not a date'))
+    ]);
+    const { monthlyCounts, vendorTotals } = analyzer.getColumnScan();
+
+    expect([...monthlyCounts[0].values()]).toEqual([1, 1, 1, 1, 1, 1, 12]);
+    expect(vendorTotals[0]).toBe(4800);
+    expect(analyzer.detectFrequencyAnomalies().map(anomaly => anomaly.date)).toEqual(['2024-07']);
+  });
+});
+
+describe('Crundwell pattern', () => {
+  const smallPayments = (vendor, startDay) => Array.from({ length: 20 }, (_, i) => makeRow(
+    vendor,
+    2900,
+    new Date(Date.UTC(2024, 0, startDay + i, 10)).toISOString(),
+    { transaction_id: `${vendor}${i + 1}` }
+  ));
+
+  test('Vendors are reported in order of their first small payment', () => {
+    // Acme's first row is large, so Globex's small payments come first
+    const analyzer = loadAnalyzer([
+      makeRow('Acme', 9000, '2024-01-01T10:00:00', { transaction_id: 'A0' }),
+      ...smallPayments('Globex', 2),
+      ...smallPayments('Acme', 40)
+    ]);
+    const structuring = analyzer.detectEmbezzlementPatterns()
+      .filter(anomaly => anomaly.embezzlementPattern === 'Crundwell Pattern');
+
+    expect(structuring.map(anomaly => anomaly.transactionId)).toEqual([
+      'Globex18', 'Globex19', 'Globex20', 'Acme18', 'Acme19', 'Acme20'
+    ]);
+    expect(structuring[0].reason).toBe('Potential structuring: 20 small payments totaling $58,000');
+  });
+});
+
+describe('Seeded sample data', () => {
+  // Anomalies the original, unoptimized analyzer found in this same sample
+  const baseline = require('./fixtures/seeded-sample-anomalies.json');
+
+  // Deterministic stand-in for Math.random (mulberry32)
+  const seededRandom = seed => () => {
+    seed = (seed + 0x6D2B79F5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+
+  let rows;
+  let anomalies;
+
+  beforeAll(() => {
+    jest.useFakeTimers().setSystemTime(new Date('2024-06-15T12:00:00Z'));
+    jest.spyOn(Math, 'random').mockImplementation(seededRandom(20240615));
+    try {
+      rows = generateSampleData();
+    } finally {
+      Math.random.mockRestore();
+      jest.useRealTimers();
+    }
+    anomalies = loadAnalyzer(JSON.parse(JSON.stringify(rows))).runFullAnalysis();
+  });
+
+  test('Every generated row carries a transaction ID', () => {
+    expect(rows).toHaveLength(252);
+    expect(rows.every(row => /^TXN\d{4}$/.test(row.transaction_id))).toBe(true);
+  });
+
+  test('Finds exactly the baseline anomalies', () => {
+    const found = anomalies.map(anomaly => JSON.stringify({
+      transactionId: anomaly.transactionId,
+      anomalyType: anomaly.anomalyType,
+      vendor: anomaly.vendor,
+      date: anomaly.date instanceof Date ? anomaly.date.toISOString() : anomaly.date,
+      amount: anomaly.amount,
+      riskScore: anomaly.riskScore,
+      reason: formatAnomalyReason(anomaly)
+    })).sort().map(record => JSON.parse(record));
+
+    expect(found).toHaveLength(baseline.length);
+    expect(found).toEqual(baseline);
+  });
+});
+
+describe('exportResults', () => {
+  let analyzer;
+  let outDir;
+
+  beforeAll(() => {
+    analyzer = loadAnalyzer(generateSampleData());
+    analyzer.runFullAnalysis();
+    outDir = fs.mkdtempSync(path.join(os.tmpdir(), 'oqualtix-export-'));
+  });
+
+  afterAll(() => {
+    fs.rmSync(outDir, { recursive: true, force: true });
+  });
+
+  test.each([1, 7, 1000, undefined])('Batch size %p writes the ranked records as one JSON array', batchSize => {
+    const file = path.join(outDir, `anomalies-${batchSize}.json`);
+    const ranked = [...analyzer.anomalies]
+      .sort((a, b) => b.riskScore - a.riskScore)
+      .map(anomaly => ({ ...anomaly, reason: formatAnomalyReason(anomaly) }));
+
+    analyzer.exportResults(file, batchSize);
+
+    expect(fs.readFileSync(file, 'utf8')).toBe(JSON.stringify(ranked, null, 2));
+  });
+
+  test.each([0, -1, 2.5, NaN])('Batch size %p is rejected before writing', batchSize => {
+    const file = path.join(outDir, 'rejected.json');
+
+    expect(() => analyzer.exportResults(file, batchSize)).toThrow(RangeError);
+    expect(fs.existsSync(file)).toBe(false);
+  });
+
+  test('Writes no file when there are no anomalies', () => {
+    const file = path.join(outDir, 'empty.json');
+
+    new FraudDetectionAnalyzer().exportResults(file);
+
+    expect(fs.existsSync(file)).toBe(false);
+  });
+});
+
+describe('Fallback transaction IDs', () => {
+  // Twelve rows without IDs; every third one is a round amount
+  const unlabelledRows = () => Array.from({ length: 12 }, (_, i) => makeRow('Acme', i % 3 ? 120 + i : 5000));
+  const roundIds = analyzer => analyzer.detectRoundDollarPatterns()
+    .filter(anomaly => anomaly.anomalyType === 'Round Dollar Pattern')
+    .map(anomaly => anomaly.transactionId);
+
+  test('Rows without an ID are reported by position', () => {
+    const rows = unlabelledRows();
+    rows[3].transaction_id = 'INV-7';
+
+    expect(roundIds(loadAnalyzer(rows))).toEqual(['txn_0', 'INV-7', 'txn_6', 'txn_9']);
+  });
+
+  test('The IDs are not written to the caller\'s rows', () => {
+    const rows = unlabelledRows();
+    loadAnalyzer(rows).runFullAnalysis();
+
+    expect(rows.some(row => 'transaction_id' in row)).toBe(false);
+  });
+
+  test('Reloading a subset numbers its rows afresh', () => {
+    const rows = unlabelledRows();
+    const analyzer = loadAnalyzer(rows);
+    analyzer.runFullAnalysis();
+    analyzer.loadData(null, rows.slice(6));
+
+    expect(roundIds(analyzer)).toEqual(['txn_0', 'txn_3']);
+  });
+});
+
+describe('StatUtils.clip', () => {
+  test('Clamps in place and returns the same array', () => {
+    const values = Float64Array.of(-5, 0, 50, 100, 150);
+
+    expect(StatUtils.clip(values, 0, 100)).toBe(values);
+    expect(Array.from(values)).toEqual([0, 0, 50, 100, 100]);
+  });
+
+  test('Supports one-sided bounds', () => {
+    expect(Array.from(StatUtils.clip(Float64Array.of(-5, 90, 120), -Infinity, 85))).toEqual([-5, 85, 85]);
+    expect(Array.from(StatUtils.clip(Float64Array.of(-5, 90, 120), 0, Infinity))).toEqual([0, 90, 120]);
+  });
+});
+
+describe('Risk scores', () => {
+  test('Outlier scores are (sigma - 3) * 20 + 70, clamped to [0, 100]', () => {
+    const steady = (vendor, count) => Array.from({ length: count }, (_, i) => makeRow(vendor, 1000 + (i % 2 ? 10 : -10)));
+    const analyzer = loadAnalyzer([
+      ...steady('Acme', 200), makeRow('Acme', 1040),
+      ...steady('Globex', 40), makeRow('Globex', 90000)
+    ]);
+    analyzer.computeVendorStatistics();
+    const outliers = analyzer.detectStatisticalOutliers();
+
+    expect(outliers.map(anomaly => anomaly.vendor)).toEqual(['Acme', 'Globex']);
+    expect(outliers[0].riskScore).toBeLessThan(100);
+    expect(outliers[1].riskScore).toBe(100);
+    outliers.forEach(anomaly => {
+      expect(anomaly.riskScore).toBe(Math.min(100, Math.max(0, (anomaly.sigmaMultiplier - 3) * 20 + 70)));
+    });
+  });
+
+  test('Round-dollar scores grow with the amount up to 85', () => {
+    const analyzer = loadAnalyzer([1000, 200000, 600000].map(amount => makeRow('Acme', amount)));
+    const scores = analyzer.detectRoundDollarPatterns()
+      .filter(anomaly => anomaly.anomalyType === 'Round Dollar Pattern')
+      .map(anomaly => anomaly.riskScore);
+
+    expect(scores).toEqual([40.1, 60, 85]);
+  });
+});
+
+describe('Deferred reasons', () => {
+  // Text the detectors built eagerly before reasons were deferred
+  const eagerReasons = {
+    'Statistical Outlier': 'Amount $1,240.00 exceeds vendor threshold $1,231.29 (3.8σ above mean)',
+    'Round Dollar Pattern': 'Suspicious round dollar amount: $15,000.00',
+    'Threshold Evasion': 'Amount $4,950.00 just under $5,000 threshold (possible approval evasion)',
+    'Round Dollar Embezzlement': 'Round dollar amount pattern: $15,000 (typical of corporate card abuse)',
+    'Threshold Evasion Embezzlement': 'Amount $4,950 suspiciously close to $5,000 threshold',
+    'Off-Hours Embezzlement': 'Large transaction during off-hours: $15,000 on 3/16/2024 at 3:00'
+  };
+  let anomalies;
+
+  beforeAll(() => {
+    anomalies = loadAnalyzer([
+      ...Array.from({ length: 200 }, (_, i) => makeRow('Acme', 1200 + (i % 2 ? 10 : -10))),
+      makeRow('Acme', 1240),
+      makeRow('Shell Co', 15000, '2024-03-16T03:00:00'),
+      makeRow('Shell Co', 4950)
+    ]).runFullAnalysis();
+  });
+
+  test.each(Object.keys(eagerReasons))('%s text matches the eager text', anomalyType => {
+    const anomaly = anomalies.find(record => record.anomalyType === anomalyType);
+
+    expect(anomaly.reason).toBeUndefined();
+    expect(formatAnomalyReason(anomaly)).toBe(eagerReasons[anomalyType]);
+  });
+
+  test('Reasons set by a detector are returned as they are', () => {
+    const concentration = anomalies.find(record => record.anomalyType === 'Vendor Concentration');
+
+    expect(formatAnomalyReason(concentration)).toBe(concentration.reason);
+    expect(concentration.reason).toBe('Vendor receives 92.4% of all payments ($241,240.00 of $261,190.00)');
+  });
+});
+
+describe('Fused column scan', () => {
+  const thresholds = [1000, 2500, 5000, 10000, 25000, 50000];
+  let analyzer;
+  let scan;
+
+  beforeAll(() => {
+    analyzer = loadAnalyzer([
+      ...generateSampleData(),
+      makeRow('Round Dollar Corp', 2400, 'not a date'),
+      makeRow('Office Supplies Inc', 1000.004)
+    ]);
+    analyzer.computeVendorStatistics();
+    scan = analyzer.getColumnScan();
+  });
+
+  // Row indices matching a per-row test, the way each detector used to scan
+  const rowsWhere = predicate => analyzer.data.flatMap((row, i) => (predicate(row) ? [i] : []));
+
+  test('Outlier rows exceed their vendor\'s 3σ threshold', () => {
+    expect(scan.outlierRows).toEqual(rowsWhere(row => {
+      const stats = analyzer.vendorStats[row.vendor];
+      return stats !== undefined && row.amount > stats.threshold3Sigma;
+    }));
+  });
+
+  test('Round and evasion rows match the per-row tests', () => {
+    expect(scan.roundRows).toEqual(rowsWhere(row => row.amount % 100 === 0 && row.amount >= 1000));
+
+    const evaded = row => thresholds.find(threshold => row.amount >= threshold - 100 && row.amount < threshold);
+    expect(scan.evasionRows).toEqual(rowsWhere(row => evaded(row) !== undefined));
+    expect(scan.evasionThresholds).toEqual(scan.evasionRows.map(i => evaded(analyzer.data[i])));
+  });
+
+  test('Monthly counts and totals match grouping the rows', () => {
+    const { vendors } = analyzer.columns;
+    const expectedMonths = vendors.map(() => ({}));
+    const expectedTotals = vendors.map(() => 0);
+    analyzer.data.forEach((row, i) => {
+      const code = analyzer.columns.vendorCode[i];
+      expectedTotals[code] += row.amount;
+      if (!Number.isNaN(row.date.getTime())) {
+        const key = row.date.getFullYear() * 12 + row.date.getMonth();
+        expectedMonths[code][key] = (expectedMonths[code][key] || 0) + 1;
+      }
+    });
+
+    expect(scan.monthlyCounts.map(months => Object.fromEntries(months))).toEqual(expectedMonths);
+    expect(Array.from(scan.vendorTotals)).toEqual(expectedTotals);
+    expect(scan.totalAmount).toBe(analyzer.data.reduce((sum, row) => sum + row.amount, 0));
+  });
+
+  test('The scan is shared until the vendor statistics change', () => {
+    expect(analyzer.getColumnScan()).toBe(scan);
+
+    analyzer.computeVendorStatistics();
+    expect(analyzer.getColumnScan()).not.toBe(scan);
+  });
+});